@@ -200,7 +200,7 @@ def read_room(elem):
     # print(scripts)
     # print(sounds)
     # print(lscripts)
-    elem.children[:] = sorted(elem.children, key=lambda elem: elem.attribs['offset'])
+    elem.children = sorted(elem.children, key=lambda elem: elem.attribs['offset'])
     # earwax.render(elem)
 
     return elem
@@ -208,7 +208,7 @@ def open_game_resource(filename: str, chiper_key=0x00):
 
             room_chunk = next(earwax(schema=schema, max_depth=0).map_chunks(t.data, offset=c, parent=t, extra=path_only), None)
             assert room_chunk.tag == 'RO', room_chunk
-            t.children.append(room_chunk)
+            children = [*t.children, room_chunk]
             c += len(bytes(room_chunk.chunk))
             # print('ROOOM')
             # earwax.render(room_chunk)
@@ -219,13 +219,13 @@ def open_game_resource(filename: str, chiper_key=0x00):
                     # earwax.render(a)
                     assert a.tag == '_' or t.data[c+4:c+6] == a.tag.encode(), (t.data[c+4:c+6], a.tag.encode())
                     c += len(bytes(a.chunk))
-                    t.children.append(a)
+                    children.append(a)
                     # print(a)
             except UnexpectedBufferSize as exc:
                 print(f'warning: {exc}')
             rawd = t.data[c:]
             if rawd != b'':
-                t.children.append(
+                children.append(
                     create_element(
                         c,
                         Chunk('__', rawd, Splicer(0, len(rawd))),
@@ -236,6 +236,7 @@ def open_game_resource(filename: str, chiper_key=0x00):
                 # print(len(rawd))
                 # for chnk in grouper(rawd, 100):
                 #     print('RAWD', bytes(x for x in chnk if x is not None))
+            t.children = tuple(children)
         yield from root
 
 def dump_resources(
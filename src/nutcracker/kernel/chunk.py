@@ -1,4 +1,5 @@
 import builtins
+import sys
 from dataclasses import dataclass
 from functools import cached_property
 from typing import IO, Iterator, NamedTuple, Protocol, Sequence, Union, overload
@@ -81,7 +82,8 @@ class StructuredChunk(ChunkFactory, _StructuredChunkHeader):
         header = self.unpack_from(buffer, offset)
         splicer = Splicer(self.size, header.size - self.size)
         return Chunk(
-            header.etag.decode('ascii'),
+            # interned so tag comparisons and lookups against literals are cheap
+            sys.intern(header.etag.decode('ascii')),
             splice(buffer, offset, header.size),
             splicer,
         )
@@ -1,12 +1,73 @@
 from collections import Counter
 from dataclasses import dataclass, field, replace
-from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
 
 from .chunk import Chunk
 
 ElementTree = Union[Iterator['Element'], 'Element', None]
 
 
+class LazyChildren(Sequence['Element']):
+    """Read-only children sequence, loaded on first access.
+
+    Loading is retried on every access until it succeeds,
+    so errors are raised again rather than leaving no children.
+    """
+
+    def __init__(self, load: Callable[[], Iterable['Element']]) -> None:
+        self._load_children: Optional[Callable[[], Iterable['Element']]] = load
+        self._items: Tuple['Element', ...] = ()
+
+    def _load(self) -> Tuple['Element', ...]:
+        if self._load_children is not None:
+            self._items = tuple(self._load_children())
+            self._load_children = None
+        return self._items
+
+    @overload
+    def __getitem__(self, index: int) -> 'Element':
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence['Element']:
+        ...
+
+    def __getitem__(
+        self,
+        index: Union[int, slice],
+    ) -> Union['Element', Sequence['Element']]:
+        return self._load()[index]
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __iter__(self) -> Iterator['Element']:
+        return iter(self._load())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return self._load() == tuple(other)
+
+    def __repr__(self) -> str:
+        if self._load_children is not None:
+            return 'LazyChildren<...>'
+        return f'LazyChildren{self._items}'
+
+
 @dataclass
 class Element(object):
     """Indexing metadata for chunk containers
@@ -23,6 +84,9 @@ class Element(object):
     children: Sequence['Element']
 
     _data: Optional[bytes] = field(default=None, repr=False, init=False)
+    _tag_index: Optional[
+        Tuple[Sequence['Element'], Dict[str, List['Element']]]
+    ] = field(default=None, repr=False, init=False, compare=False)
 
     @property
     def tag(self) -> str:
@@ -38,11 +102,31 @@ class Element(object):
     def data(self, value: bytes) -> None:
         self._data = value
 
+    def children_by_tag(self) -> Optional[Mapping[str, Sequence['Element']]]:
+        """Children grouped by lowercase tag.
+        Only available for immutable children (tuple or LazyChildren),
+        None otherwise, as in-place changes to a list cannot be detected.
+        """
+        children = self.children
+        if not isinstance(children, (tuple, LazyChildren)):
+            return None
+        if self._tag_index is not None and self._tag_index[0] is children:
+            return self._tag_index[1]
+        by_tag: Dict[str, List['Element']] = {}
+        for child in children:
+            by_tag.setdefault(child.tag.lower(), []).append(child)
+        self._tag_index = (children, by_tag)
+        return by_tag
+
     def __iter__(self) -> Iterator['Element']:
         return iter(self.children)
 
     def content(self, children: Iterable['Element']) -> 'Element':
-        return replace(self, children=list(children))
+        return replace(self, children=tuple(children))
+
+    def lazy_content(self, load: Callable[[], Iterable['Element']]) -> 'Element':
+        """Create copy of element with children loaded on first access."""
+        return replace(self, children=LazyChildren(load))
 
     def __repr__(self) -> str:
         attribs = ' '.join(f'{key}={val}' for key, val in self.attribs.items())
@@ -1,8 +1,7 @@
 #!/usr/bin/env python3
 
-from contextlib import contextmanager
-from dataclasses import replace
-from typing import Any, Callable, Dict, FrozenSet, Iterator, Optional, Set
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, Optional, Set
 
 from .chunk import Chunk
 from .element import Element
@@ -23,27 +22,17 @@ class MissingSchemaEntry(Exception):
         self.tag = tag
 
 
-@contextmanager
-def exception_ptag_context(ptag: Optional[str]) -> Iterator[None]:
-    try:
-        yield
-    except Exception as exc:
-        if not hasattr(exc, 'ptag'):
-            exc.ptag = ptag  # type: ignore
-        raise exc
-
-
 def check_schema(cfg: _IndexSetting, ptag: Optional[str], tag: str) -> None:
-    try:
-        if ptag and tag not in cfg.schema[ptag]:
-            raise MissingSchemaEntry(ptag, tag)
-        if tag not in cfg.schema:
-            raise MissingSchemaKey(tag)
-    except (MissingSchemaKey, MissingSchemaEntry) as exc:
-        if cfg.strict:
-            raise exc
-        else:
-            cfg.logger.warning(exc)
+    exc: Exception
+    if ptag and tag not in cfg.schema[ptag]:
+        exc = MissingSchemaEntry(ptag, tag)
+    elif tag not in cfg.schema:
+        exc = MissingSchemaKey(tag)
+    else:
+        return
+    if cfg.strict:
+        raise exc
+    cfg.logger.warning(exc)
 
 
 def create_element(offset: int, chunk: Chunk, **attrs: Any) -> Element:
@@ -64,50 +53,98 @@ def map_chunks(
     if parent and not cfg.schema.get(parent.tag):
         return
     data = memoryview(data)
-    with exception_ptag_context(ptag):
+    try:
         for offset, chunk in read_chunks(cfg, data, offset=offset):
             check_schema(cfg, ptag, chunk.tag)
 
-            elem = create_element(
-                offset,
-                chunk,
-                **(extra(parent, chunk, offset) if extra else {}),
-            )
-            yield elem.content(
-                map_chunks(
-                    cfg,
-                    chunk.slice(chunk.buffer),
-                    parent=elem,
-                    level=level + 1,
-                    extra=extra,
-                ),
+            if extra:
+                elem = create_element(offset, chunk, **extra(parent, chunk, offset))
+            else:
+                elem = create_element(offset, chunk)
+            children = partial(
+                map_chunks,
+                cfg,
+                chunk.slice(chunk.buffer),
+                parent=elem,
+                level=level + 1,
+                extra=extra,
             )
+            yield elem.lazy_content(children) if cfg.lazy else elem.content(children())
+    except Exception as exc:
+        if not hasattr(exc, 'ptag'):
+            exc.ptag = ptag  # type: ignore
+        raise
+
+
+class _DataTag(Exception):
+    """Content of chunks with given tag cannot be read as chunks."""
+
+    def __init__(self, tag: str) -> None:
+        super().__init__(f'Cannot read {tag} content as chunks')
+        self.tag = tag
+
+
+class _SchemaCollector(object):
+    """Accumulate schema of given chunk resource in a single pass.
+
+    Every chunk is speculatively read as a container.
+    When reading its content fails, its tag is marked as data.
+    The failure is raised up to the outermost chunk of the same tag
+    still being read, so every open chunk of that tag becomes data as well.
+    """
+
+    def __init__(self, cfg: _IndexSetting) -> None:
+        self.cfg = cfg
+        self.schema: Dict[str, Set[str]] = {}
+        self.data_tags: Set[str] = set()
+        self._open_tags: Set[str] = set()
+
+    def collect(self, data: bytes, ptag: Optional[str] = None, level: int = 0) -> None:
+        if self.cfg.max_depth and level >= self.cfg.max_depth:
+            return
+        for _, chunk in read_chunks(self.cfg, data):
+            tag = chunk.tag
+            if ptag is not None:
+                self.schema[ptag].add(tag)
+            self.schema.setdefault(tag, set())
+            if tag in self.data_tags:
+                continue
+            outermost = tag not in self._open_tags
+            self._open_tags.add(tag)
+            try:
+                self.collect(chunk.slice(chunk.buffer), ptag=tag, level=level + 1)
+            except _DataTag as exc:
+                if exc.tag != tag or not outermost:
+                    raise
+                self._mark_data(tag)
+            except Exception as exc:
+                if not outermost:
+                    raise _DataTag(tag) from exc
+                self._mark_data(tag)
+            finally:
+                if outermost:
+                    self._open_tags.discard(tag)
+
+    def result(self) -> Dict[str, Set[str]]:
+        # containers without any children were never confirmed
+        return {
+            tag: children
+            for tag, children in self.schema.items()
+            if children or tag in self.data_tags
+        }
+
+    def _mark_data(self, tag: str) -> None:
+        self.schema[tag] = set()
+        self.data_tags.add(tag)
 
 
 def generate_schema(cfg: _IndexSetting, data: bytes) -> Dict[str, Set[str]]:
-    EMPTY: FrozenSet[str] = frozenset()
-    DUMMY: FrozenSet[str] = frozenset(('__DUMMY__',))
-
-    schema: Dict[str, FrozenSet[str]] = {}
-
-    # TODO: check if partial iterations are possible
-    while True:
-        cfg = replace(cfg, schema=schema, strict=True)
-        try:
-            # generate schema for 1 level deeper
-            for _ in map_chunks(cfg, data, level=-1):
-                pass
-            return {ptag: set(tags) for ptag, tags in schema.items() if tags != DUMMY}
-        except MissingSchemaKey as miss:
-            schema[miss.tag] = DUMMY  # creates new copy
-        except MissingSchemaEntry as miss:
-            schema[miss.ptag] -= DUMMY
-            schema[miss.ptag] |= {miss.tag}
-        except Exception as exc:
-            # pylint: disable=no-member
-            assert hasattr(exc, 'ptag')
-            if schema.get(exc.ptag) == EMPTY:  # type: ignore
-                raise ValueError(
-                    'Cannot create schema for given file with given configuration',
-                )
-            schema[exc.ptag] = EMPTY  # type: ignore
+    collector = _SchemaCollector(cfg)
+    try:
+        # generate schema for 1 level deeper
+        collector.collect(memoryview(data), level=-1)
+    except Exception as exc:
+        raise ValueError(
+            'Cannot create schema for given file with given configuration',
+        ) from exc
+    return collector.result()
@@ -1,4 +1,4 @@
-from typing import Iterable, Iterator, Tuple
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
 
 from .chunk import Chunk
 
@@ -14,10 +14,17 @@ def print_chunks(
     chunks: Iterable[Tuple[int, Chunk]],
     level: int = 0,
     base: int = 0,
+    emit: Optional[Callable[[str], Any]] = print,
 ) -> Iterator[Tuple[int, Chunk]]:
+    """Pass through (offset, chunk) tuples, emitting a line for each chunk.
+    Set emit to None to skip formatting altogether.
+    """
+    if emit is None:
+        yield from ((base + offset, chunk) for offset, chunk in chunks)
+        return
     indent = '    ' * level
     for offset, chunk in chunks:
-        print(f'{indent}{base + offset} {chunk.tag} {len(chunk.data)}')
+        emit(f'{indent}{base + offset} {chunk.tag} {len(chunk.data)}')
         yield base + offset, chunk
 
 
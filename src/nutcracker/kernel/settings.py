@@ -57,8 +57,13 @@ class _IndexSetting(_ChunkSetting):
     strict: if set to True, throws error on schema mismatch, otherwise log warning
 
     max_depth: limit levels of container chunks to index, None for unlimited
+
+    lazy: if set to True, children of each element are indexed on first access,
+        as read-only sequence. schema errors are reported on access as well.
+        not suitable with stateful `extra` callbacks, as indexing order changes.
     """
 
     schema: Mapping[str, Set[str]] = field(default_factory=dict)
     strict: bool = False
     max_depth: Optional[int] = None
+    lazy: bool = False
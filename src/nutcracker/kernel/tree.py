@@ -1,18 +1,38 @@
 import io
 import os
 import sys
-from typing import IO, Iterator, Optional
+from functools import lru_cache
+from typing import IO, Callable, Iterator, List, Optional, Tuple
 
-from parse import parse
+import parse
 
 from .element import Element, ElementTree
 
 
+@lru_cache(maxsize=None)
+def _compile_tag(pattern: str) -> Callable[[str], bool]:
+    """Create matcher for given tag pattern.
+    Literal tags are compared directly, skipping the format parser,
+    but stay case-insensitive like parse.
+    """
+    if '{' not in pattern:
+        folded = pattern.lower()
+        return lambda tag: tag.lower() == folded
+    parser = parse.compile(pattern)
+    return lambda tag: bool(parser.parse(tag, evaluate_result=False))
+
+
 def findall(tag: str, root: ElementTree) -> Iterator[Element]:
     if not root:
         return
+    if isinstance(root, Element) and '{' not in tag:
+        by_tag = root.children_by_tag()
+        if by_tag is not None:
+            yield from by_tag.get(tag.lower(), ())
+            return
+    match = _compile_tag(tag)
     for elem in root:
-        if parse(tag, elem.tag, evaluate_result=False):
+        if match(elem.tag):
             yield elem
 
 
@@ -20,12 +40,20 @@ def find(tag: str, root: ElementTree) -> Optional[Element]:
     return next(findall(tag, root), None)
 
 
-def findpath(path: str, root: Optional[Element]) -> Optional[Element]:
+@lru_cache(maxsize=1024)
+def _split_path(path: str) -> Tuple[str, ...]:
     path = os.path.normpath(path)
-    if not path or path == '.':
-        return root
-    dirname, basename = os.path.split(path)
-    return find(basename, findpath(dirname, root))
+    if path == '.':
+        return ()
+    return tuple(path.split(os.sep))
+
+
+def findpath(path: str, root: Optional[Element]) -> Optional[Element]:
+    for part in _split_path(path):
+        if root is None:
+            break
+        root = find(part, root)
+    return root
 
 
 def render(
@@ -35,18 +63,25 @@ def render(
 ) -> None:
     if not element:
         return
-    attribs = ''.join(
-        f' {key}="{value}"'
-        for key, value in element.attribs.items()
-        if value is not None
-    )
-    indent = '    ' * level
-    closing = '' if element.children else ' /'
-    print(f'{indent}<{element.tag}{attribs}{closing}>', file=stream)
-    if element.children:
-        for elem in element.children:
-            render(elem, level=level + 1, stream=stream)
-        print(f'{indent}</{element.tag}>', file=stream)
+    lines: List[str] = []
+    stack: List[Tuple[Element, int, bool]] = [(element, level, False)]
+    while stack:
+        elem, depth, closing_tag = stack.pop()
+        indent = '    ' * depth
+        if closing_tag:
+            lines.append(f'{indent}</{elem.tag}>\n')
+            continue
+        attribs = ''.join(
+            f' {key}="{value}"'
+            for key, value in elem.attribs.items()
+            if value is not None
+        )
+        closing = '' if elem.children else ' /'
+        lines.append(f'{indent}<{elem.tag}{attribs}{closing}>\n')
+        if elem.children:
+            stack.append((elem, depth, True))
+            stack.extend((child, depth + 1, False) for child in reversed(elem.children))
+    stream.write(''.join(lines))
 
 
 def renders(element: Optional[Element]) -> str:
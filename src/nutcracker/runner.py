@@ -1,3 +1,5 @@
+from multiprocessing import freeze_support
+
 import typer
 
 from nutcracker.smush import runner as smush
@@ -8,4 +10,5 @@ app.add_typer(smush.app, name='smush')
 app.add_typer(sputm.app, name='sputm')
 
 if __name__ == "__main__":
+    freeze_support()
     app()
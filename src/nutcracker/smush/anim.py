@@ -1,10 +1,10 @@
 import itertools
-from typing import Any, Dict, Iterator, NamedTuple, Optional
+from typing import Iterator, NamedTuple, Optional
 
 from nutcracker.smush import ahdr
 from nutcracker.smush.element import read_data, read_elements
 from nutcracker.smush.preset import smush
-from nutcracker.smush.types import Chunk, Element
+from nutcracker.smush.types import Element
 from nutcracker.utils.fileio import read_file
 
 
@@ -47,18 +47,13 @@ def compose(header: ahdr.AnimationHeader, frames: Iterator[bytes]) -> bytes:
 
 
 def from_bytes(resource: bytes) -> Element:
-    it = itertools.count()
-
-    def set_frame_id(
-        parent: Optional[Element],
-        chunk: Chunk,
-        offset: int,
-    ) -> Dict[str, Any]:
-        if chunk.tag != 'FRME':
-            return {}
-        return {'id': next(it)}
-
-    return next(smush.map_chunks(resource, extra=set_frame_id))
+    root = next(smush.map_chunks(resource))
+    frame_id = 0
+    for elem in root.children:
+        if elem.tag == 'FRME':
+            elem.attribs['id'] = frame_id
+            frame_id += 1
+    return root
 
 
 def from_path(path: str) -> Element:
@@ -1,12 +1,14 @@
 #!/usr/bin/env python3
 
+import logging
 import os
-import struct
-from dataclasses import dataclass, replace
-from functools import partial
-from typing import Callable, Iterator, Mapping, Optional, Sequence, Tuple
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, Mapping, Optional, Tuple
 
-from nutcracker.codex.codex import get_decoder
+import numpy as np
+
+from nutcracker.codex.codex import decoders, get_decoder
 from nutcracker.graphics import grid, image
 from nutcracker.graphics.frame import save_single_frame_image
 from nutcracker.smush import anim
@@ -14,31 +16,51 @@ from nutcracker.smush.ahdr import AnimationHeader
 from nutcracker.smush.fobj import decompress, unobj
 from nutcracker.smush.types import Element
 
+logger = logging.getLogger(__name__)
 
-def clip(lower: int, upper: int, value: int) -> int:
-    return lower if value < lower else upper if value > upper else value
+# decoder lookup by codec id, NotImplemented for unsupported codecs
+_DECODERS = [get_decoder(codec) for codec in range(max(decoders) + 1)]
 
 
-clip_byte = partial(clip, 0, 255)
+def read_palette(data: bytes, offset: int = 0) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.uint8, count=0x300, offset=offset)
 
 
-def delta_color(org_color: int, delta: int) -> int:
-    return clip_byte((129 * org_color + delta) // 128)
+def delta_palette(palette: np.ndarray, delta_pal: np.ndarray) -> np.ndarray:
+    # (129 * color + delta) / 128, clamped to byte range; computed in place
+    pal = palette.astype(np.int32)
+    pal *= 129
+    pal += delta_pal
+    pal >>= 7
+    np.clip(pal, 0, 255, out=pal)
+    return pal.astype(np.uint8)
 
 
-@dataclass(frozen=True)
-class FrameGenCtx:
-    palette: bytes
-    screen: Tuple[image.ImagePosition, image.Matrix] = (
-        image.ImagePosition(),
-        (),
-    )
-    delta_pal: Sequence[int] = ()
-    frame: Optional[Element] = None
+class FrameGenCtx(object):
+    """Decoding state carried across frames.
+
+    Updated in place by frame component handlers,
+    so consumers should copy any field they need to keep.
+    """
+
+    __slots__ = ('palette', 'screen', 'delta_pal', 'frame')
+
+    def __init__(
+        self,
+        palette: np.ndarray,
+        screen: Optional[Tuple[image.ImagePosition, image.Matrix]] = None,
+        delta_pal: Optional[np.ndarray] = None,
+        frame: Optional[Element] = None,
+    ) -> None:
+        self.palette = palette
+        self.screen = screen or (image.ImagePosition(), ())
+        self.delta_pal = delta_pal
+        self.frame = frame
 
 
 def npal(ctx: FrameGenCtx, data: bytes) -> FrameGenCtx:
-    return replace(ctx, palette=tuple(data))
+    ctx.palette = read_palette(data)
+    return ctx
 
 
 def xpal(ctx: FrameGenCtx, data: bytes) -> FrameGenCtx:
@@ -47,31 +69,30 @@ def xpal(ctx: FrameGenCtx, data: bytes) -> FrameGenCtx:
     if sub_size == 0x300 * 3 + 4:
         # print('LARGE XPAL', data[: 4])
         assert data[:4] == b'\00\00\00\02', (ctx.frame, data[:4])
-        delta_pal = struct.unpack(f'<{0x300}h', data[4 : 4 + 2 * 0x300])
-        palette = data[4 + 2 * 0x300 :]
-        return replace(ctx, delta_pal=delta_pal, palette=palette)
+        # zero-copy view over chunk data
+        ctx.delta_pal = np.frombuffer(data, dtype='<i2', count=0x300, offset=4)
+        ctx.palette = read_palette(data, offset=4 + 2 * 0x300)
+        return ctx
 
     if sub_size == 6:
         # print('SMALL XPAL', data)
         assert data[:4] == b'\00\00\00\01', (ctx.frame, data[:4])
         # what about data[4:]? (two last bytes)
         # seems like UINT16LE, value is usually 0, FT have counter examples
-        assert len(ctx.delta_pal) == 0x300
+        assert ctx.delta_pal is not None and len(ctx.delta_pal) == 0x300
         assert len(ctx.palette) == 0x300
-        palette = bytes(
-            delta_color(pal, delta) for pal, delta in zip(ctx.palette, ctx.delta_pal)
-        )
-        return replace(ctx, palette=palette)
+        ctx.palette = delta_palette(ctx.palette, ctx.delta_pal)
+        return ctx
 
     assert False
 
 
 def decode_frame_object(ctx: FrameGenCtx, data: bytes) -> FrameGenCtx:
-    screen = convert_fobj(data)
+    ctx.screen = convert_fobj(data)
     # im = save_single_frame_image(ctx.screen)
     # im.putpalette(ctx.palette)
     # im.save(f'out/FRME_{idx:05d}_{cidx:05d}.png')
-    return replace(ctx, screen=screen)
+    return ctx
 
 
 def decode_compressed_frame_object(ctx: FrameGenCtx, data: bytes) -> FrameGenCtx:
@@ -96,29 +117,37 @@ def generate_frames(
     frames: Iterator[Element],
     parser: Mapping[str, Callable[[FrameGenCtx, bytes], FrameGenCtx]],
 ) -> Iterator[FrameGenCtx]:
-    ctx = FrameGenCtx(header.palette)
+    get_handler = parser.get
+    ctx = FrameGenCtx(read_palette(header.palette))
     for frame in frames:
-        ctx = replace(ctx, frame=frame)
+        ctx.frame = frame
         for comp in frame.children:
-            ctx = DECODE_FRAME_IMAGE.get(comp.tag, unsupported_frame_comp)(
-                ctx,
-                comp.data,
-            )
+            handler = get_handler(comp.tag, unsupported_frame_comp)
+            ctx = handler(ctx, comp.data)
         assert ctx.screen is not None
         yield ctx
 
 
+def _iter_lchars(
+    header: AnimationHeader,
+    frames: Iterator[Element],
+) -> Iterator[Tuple[int, int, image.TImage]]:
+    for ctx in generate_frames(header, frames, DECODE_FRAME_IMAGE):
+        loc, im = ctx.screen
+        yield loc.x1, loc.y1, image.convert_to_pil_image(im)
+
+
 def decode_nut(root: Element, output_dir: str) -> None:
     header, frames = anim.parse(root)
     os.makedirs(output_dir, exist_ok=True)
-    chars = [ctx.screen for ctx in generate_frames(header, frames, DECODE_FRAME_IMAGE)]
-    lchars = [(loc.x1, loc.y1, image.convert_to_pil_image(im)) for loc, im in chars]
-    nchars = len(lchars)
+    # frame elements are already indexed, only decoded images are streamed
+    lframes = list(frames)
+    nchars = len(lframes)
     transparency = 39
     BGS = [b'\05', b'\04']
     bim = grid.create_char_grid(
         nchars,
-        enumerate(lchars),
+        enumerate(_iter_lchars(header, iter(lframes))),
         transparency=transparency,
         bgs=BGS,
     )
@@ -128,33 +157,73 @@ def decode_nut(root: Element, output_dir: str) -> None:
     bim.save(os.path.join(output_dir, 'chars.png'))
 
 
-def decode_san(root: Element, output_dir: str) -> None:
-    header, frames = anim.parse(root)
-    os.makedirs(output_dir, exist_ok=True)
+def _iter_frame_images(
+    header: AnimationHeader,
+    frames: Iterator[Element],
+) -> Iterator[Tuple[int, image.TImage]]:
     for idx, ctx in enumerate(generate_frames(header, frames, DECODE_FRAME_IMAGE)):
         if ctx.screen:
-            assert ctx.palette
+            assert len(ctx.palette) == 0x300
             im = save_single_frame_image(ctx.screen)
             # im = im.crop(box=(0,0,320,200))
-            im.putpalette(ctx.palette)
-            im.save(os.path.join(output_dir, f'FRME_{idx:05d}.png'))
+            im.putpalette(ctx.palette.tobytes())
+            yield idx, im
+
+
+def _save_image(im: image.TImage, path: str) -> None:
+    im.save(path)
+
+
+def _save_images_parallel(
+    images: Iterable[Tuple[image.TImage, str]],
+    workers: int,
+) -> None:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque['Future[None]'] = deque()
+        for im, path in images:
+            pending.append(pool.submit(_save_image, im, path))
+            # bound number of images waiting in memory
+            if len(pending) > 2 * workers:
+                pending.popleft().result()
+        for future in pending:
+            future.result()
+
+
+def decode_san(root: Element, output_dir: str, workers: int = 1) -> None:
+    """Decode animation frames to PNG images.
+
+    Frames are always decoded in order, as palette and codec state carry
+    over between frames; `workers` > 1 encodes and saves images in a
+    process pool.
+    """
+    header, frames = anim.parse(root)
+    os.makedirs(output_dir, exist_ok=True)
+    images = (
+        (im, os.path.join(output_dir, f'FRME_{idx:05d}.png'))
+        for idx, im in _iter_frame_images(header, frames)
+    )
+    if workers > 1:
+        _save_images_parallel(images, workers)
+        return
+    for im, path in images:
+        im.save(path)
 
 
 def convert_fobj(datam: bytes) -> Optional[Tuple[image.ImagePosition, bytes]]:
     meta, data = unobj(datam)
     width = meta.x2 - meta.x1 if meta.codec != 1 else meta.x2
     height = meta.y2 - meta.y1 if meta.codec != 1 else meta.y2
-    decode = get_decoder(meta.codec)
-    if decode == NotImplemented:
-        print(f'Codec not implemented: {meta.codec}')
+    decode = _DECODERS[meta.codec] if meta.codec < len(_DECODERS) else NotImplemented
+    if decode is NotImplemented:
+        logger.warning('Codec not implemented: %d', meta.codec)
         return None
 
     # assert len(datam) % 2 == 0, (basename, meta['codec'])
 
     if meta.x1 != 0 or meta.y1 != 0:
-        print('TELL ME')
+        logger.debug('TELL ME')
 
-    print(meta)
+    logger.debug('%s', meta)
 
     locs = image.ImagePosition(x1=meta.x1, y1=meta.y1, x2=meta.x2, y2=meta.y2)
     return locs, decode(width, height, data)
@@ -43,8 +43,9 @@ def mkobj(meta: FrameObjectHeader, data: bytes) -> bytes:
 
 
 def decompress(data: bytes) -> bytes:
-    decompressed_size = UINT32BE.unpack(data[:4])[0]
-    data = zlib.decompress(data[4:])
+    decompressed_size = UINT32BE.unpack_from(data)[0]
+    # size hint lets zlib allocate output buffer once
+    data = zlib.decompress(memoryview(data)[4:], bufsize=decompressed_size)
     assert len(data) == decompressed_size
     return data
 
@@ -34,6 +34,9 @@ def decode(
     files: List[str] = typer.Argument(..., help='Files to read from'),
     nut: bool = typer.Option(False, '--nut', help='Decode to grid image'),
     target_dir: str = typer.Option('out', '--target', '-t', help='Target directory'),
+    workers: int = typer.Option(
+        1, '--workers', '-j', help='Number of processes for saving frames'
+    ),
 ) -> None:
     for filename in get_files(files):
         basename = os.path.basename(filename)
@@ -43,7 +46,7 @@ def decode(
         if nut:
             decode_nut(root, output_dir)
         else:
-            decode_san(root, output_dir)
+            decode_san(root, output_dir, workers=workers)
 
 
 @app.command('compress')
@@ -134,7 +134,7 @@ def update_element(basedir, elements, files):
                 elem = next(sputm.map_chunks(read_file(full_path)))
                 elem.attribs = attribs
             else:
-                elem.children = list(update_element(basedir, elem, files))
+                elem.children = tuple(update_element(basedir, elem, files))
                 elem.data = sputm.write_chunks(
                     sputm.mktag(e.tag, e.data) for e in elem.children
                 )
@@ -115,7 +115,7 @@ def update_element_strings(
                 elem.data = serial + to_bytes(updated)
                 elem.attribs = attribs
             else:
-                elem.children = list(
+                elem.children = tuple(
                     update_element_strings(elem, strings, opcodes, script_map)
                 )
                 elem.data = sputm.write_chunks(
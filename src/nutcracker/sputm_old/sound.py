@@ -29,7 +29,7 @@ def inject_sound_chunks(root, sounds):
                 elem.data = next(sounds)
                 elem.attribs = attribs
             else:
-                elem.children = list(inject_sound_chunks(elem, sounds))
+                elem.children = tuple(inject_sound_chunks(elem, sounds))
                 elem.data = sputm.write_chunks(
                     sputm.mktag(e.tag, e.data) for e in elem.children
                 )
@@ -0,0 +1,132 @@
+from typing import List
+
+import pytest
+
+from nutcracker.kernel import preset, tree
+from nutcracker.kernel.index import MissingSchemaEntry
+
+SCHEMA = {'ROOT': {'CONT', 'DATA'}, 'CONT': {'DATA'}, 'DATA': set()}
+
+shell = preset.shell(align=1, schema=SCHEMA)
+
+
+def make_root() -> bytes:
+    return shell.mktag(
+        'ROOT',
+        shell.write_chunks(
+            [
+                shell.mktag('CONT', shell.mktag('DATA', b'ab')),
+                shell.mktag('CONT', shell.mktag('DATA', b'zz')),
+            ],
+        ),
+    )
+
+
+def test_find_literal_tag_is_case_insensitive() -> None:
+    root = next(shell.map_chunks(make_root()))
+    assert tree.find('cont', root) is root.children[0]
+    elem = tree.findpath('cont/data', root)
+    assert elem is not None
+    assert elem.data == b'ab'
+
+
+def test_find_uses_tag_index_for_indexed_children() -> None:
+    root = next(shell.map_chunks(make_root()))
+    by_tag = root.children_by_tag()
+    assert by_tag is not None
+    assert list(by_tag['cont']) == list(root.children)
+    assert tree.find('CONT', root) is root.children[0]
+
+
+def test_find_uses_replaced_children() -> None:
+    root = next(shell.map_chunks(make_root()))
+    first, second = root.children
+    assert tree.find('CONT', root) is first
+    root.children = (second, first)
+    assert tree.find('CONT', root) is second
+
+
+def test_find_sees_list_children_reordered_in_place() -> None:
+    root = next(shell.map_chunks(make_root()))
+    first, second = root.children
+    root.children = [first, second]
+    assert root.children_by_tag() is None
+    assert tree.find('CONT', root) is first
+    root.children[:] = [second, first]
+    assert tree.find('CONT', root) is second
+    elem = tree.findpath('CONT/DATA', root)
+    assert elem is not None
+    assert elem.data == b'zz'
+
+
+def test_lazy_children_raise_schema_error_on_every_access() -> None:
+    strict = shell(schema={**SCHEMA, 'CONT': {'ROOT'}}, strict=True, lazy=True)
+    root = next(strict.map_chunks(make_root()))
+    cont = root.children[0]
+    for _ in range(2):
+        with pytest.raises(MissingSchemaEntry):
+            len(cont.children)
+    with pytest.raises(MissingSchemaEntry):
+        tree.find('DATA', cont)
+
+
+def test_generate_schema_for_nested_chunks() -> None:
+    assert shell.generate_schema(make_root()) == {
+        'ROOT': {'CONT'},
+        'CONT': {'DATA'},
+        'DATA': set(),
+    }
+
+
+def test_generate_schema_marks_unreadable_content_as_data() -> None:
+    data = shell.mktag(
+        'ROOT',
+        shell.write_chunks(
+            [
+                shell.mktag('CONT', shell.mktag('DATA', b'ab')),
+                shell.mktag('DATA', b'\xff\xff\xff\xff\xff\xff\xff\xff\xff'),
+            ],
+        ),
+    )
+    schema = shell.generate_schema(data)
+    assert schema == {'ROOT': {'CONT', 'DATA'}, 'CONT': {'DATA'}, 'DATA': set()}
+
+
+def test_generate_schema_marks_every_open_chunk_of_data_tag() -> None:
+    data = shell.mktag(
+        'ROOT',
+        shell.mktag(
+            'XXXX',
+            shell.write_chunks(
+                [shell.mktag('XXXX', b'\xff\xff\xff'), shell.mktag('DATA', b'ab')],
+            ),
+        ),
+    )
+    schema = shell.generate_schema(data)
+    assert schema == {'ROOT': {'XXXX'}, 'XXXX': set()}
+    root = next(shell(schema=schema, strict=True).map_chunks(data))
+    assert [elem.tag for elem in root.children] == ['XXXX']
+
+
+def test_generate_schema_rejects_unreadable_resource() -> None:
+    with pytest.raises(ValueError):
+        shell.generate_schema(b'\xff\xff\xff\xff\xff\xff\xff\xff\xff')
+
+
+def test_print_chunks_without_emit_passes_offsets_through() -> None:
+    chunks = list(shell.read_chunks(make_root()))
+    assert [
+        (offset, chunk.tag)
+        for offset, chunk in shell.print_chunks(chunks, base=8, emit=None)
+    ] == [(8, 'ROOT')]
+
+
+def test_print_chunks_emits_line_per_chunk() -> None:
+    lines: List[str] = []
+    children = list(shell.read_chunks(next(shell.read_chunks(make_root()))[1].data))
+    offsets = [
+        offset
+        for offset, _ in shell.print_chunks(children, level=1, emit=lines.append)
+    ]
+    assert offsets == [0, 18]
+    assert lines == ['    0 CONT 10', '    18 CONT 10']